@@ -0,0 +1,65 @@
+import os, sys, tempfile
+import numpy as np
+import pandas as pd
+import torch
+from transformers import RobertaConfig, RobertaModel, RobertaTokenizer, TFRobertaModel
+
+from predict_metaphor import build_input_columns, compute_input_arrays
+from tf_model import create_model
+from torch_model import MetaphorModel, predict
+
+
+def convert(tf_model, dropout_rate):
+    """Copies the weights of the Keras model into an equivalent MetaphorModel."""
+    tf_roberta = next(layer for layer in tf_model.layers if isinstance(layer, TFRobertaModel))
+    dense = tf_model.layers[-1]
+
+    # Let transformers do the TF -> PyTorch name/layout mapping for the encoder
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tf_roberta.save_pretrained(tmp_dir)
+        pt_roberta = RobertaModel.from_pretrained(tmp_dir, from_tf=True, add_pooling_layer=False)
+
+    config = RobertaConfig.from_pretrained('roberta-base', output_hidden_states=False)
+    model = MetaphorModel(config, dropout_rate)
+    model.roberta.load_state_dict(pt_roberta.state_dict())
+
+    # Keras Dense kernel is (in, out), torch Linear weight is (out, in)
+    kernel, bias = dense.get_weights()
+    with torch.no_grad():
+        model.classifier.weight.copy_(torch.from_numpy(kernel.T))
+        model.classifier.bias.copy_(torch.from_numpy(bias))
+    return model.eval()
+
+
+if __name__ == '__main__':
+    MAX_SEQUENCE_LENGTH = 128
+    DROPOUT_RATE = 0.2
+    PARITY_ROWS = 256       # rows of the test data used for the TF vs torch check
+    PARITY_ATOL = 1e-4
+    h5_path = './model/model.h5'
+    pt_path = './model/model.pt'
+
+    if not os.path.exists(h5_path):
+        sys.exit(f"Checkpoint not found: {h5_path}")
+
+    print(f"Loading Keras weights from: {h5_path}")
+    tf_model = create_model(MAX_SEQUENCE_LENGTH, DROPOUT_RATE)
+    tf_model.load_weights(h5_path)
+
+    model = convert(tf_model, DROPOUT_RATE)
+    torch.save(model.state_dict(), pt_path)
+    print(f"Saved PyTorch weights to: {pt_path}")
+
+    # === Prediction parity check ===
+    tokenizer = RobertaTokenizer.from_pretrained('roberta-base')
+    test = build_input_columns(pd.read_csv('./data/tweets_preprocessed.csv').head(PARITY_ROWS))
+    inputs = compute_input_arrays(test, ['sentence', 'sentence2'], tokenizer, MAX_SEQUENCE_LENGTH)
+
+    tf_probs = tf_model.predict(inputs)
+    pt_probs = predict(model, inputs)
+    max_diff = float(np.max(np.abs(tf_probs - pt_probs)))
+    agreement = float(np.mean(np.argmax(tf_probs, axis=1) == np.argmax(pt_probs, axis=1)))
+    print(f"Parity on {len(test)} rows: max |p_tf - p_torch| = {max_diff:.2e}, label agreement = {agreement:.2%}")
+
+    if max_diff > PARITY_ATOL or agreement < 1.0:
+        sys.exit("Parity check failed: torch predictions differ from the TF model")
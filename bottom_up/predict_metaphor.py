@@ -1,10 +1,12 @@
-import os, sys
+import hashlib, os, shutil, sys
 import numpy as np
 import pandas as pd
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-import tensorflow as tf
 from tqdm import tqdm
-from transformers import RobertaTokenizer, RobertaConfig, TFRobertaModel
+from transformers import RobertaTokenizer
+
+from prefilter import candidate_mask, prefilter_recall, save_reference
+from torch_model import load_model, predict
 
 
 def preprocessing(x):
@@ -62,34 +64,71 @@ def compute_input_arrays(df, columns, tokenizer, max_sequence_length):
             np.asarray(input_segments2, dtype=np.int32)]
 
 
-def create_model():
-    input_id = tf.keras.layers.Input((MAX_SEQUENCE_LENGTH,), dtype=tf.int32)
-    input_mask = tf.keras.layers.Input((MAX_SEQUENCE_LENGTH,), dtype=tf.int32)
-    input_atn = tf.keras.layers.Input((MAX_SEQUENCE_LENGTH,), dtype=tf.int32)
-    input_id2 = tf.keras.layers.Input((MAX_SEQUENCE_LENGTH,), dtype=tf.int32)
-    input_mask2 = tf.keras.layers.Input((MAX_SEQUENCE_LENGTH,), dtype=tf.int32)
-    input_atn2 = tf.keras.layers.Input((MAX_SEQUENCE_LENGTH,), dtype=tf.int32)
-    config = RobertaConfig.from_pretrained('roberta-base', output_hidden_states=False)
-    base_model = TFRobertaModel.from_pretrained('roberta-base', config=config)
-    TransformerA = base_model(input_id, attention_mask=input_mask, token_type_ids=input_atn)[0]
-    TransformerB = base_model(input_id2, attention_mask=input_mask2, token_type_ids=input_atn2)[0]
-    output = tf.keras.layers.GlobalAveragePooling1D()(TransformerA)
-    output2 = tf.keras.layers.GlobalAveragePooling1D()(TransformerB)
-    x = tf.keras.layers.Concatenate()([output, output2])
-    x = tf.keras.layers.Dropout(DROPOUT_RATE)(x)
-    x = tf.keras.layers.Dense(2, activation='softmax')(x)
-    model = tf.keras.models.Model(inputs=[input_id, input_mask, input_atn, input_id2, input_mask2, input_atn2], outputs=x)
-    return model
+INPUT_ARRAY_NAMES = ['input_ids', 'input_masks', 'input_segments',
+                     'input_ids2', 'input_masks2', 'input_segments2']
 
 
-if __name__ == '__main__':
-    MAX_SEQUENCE_LENGTH = 128
-    DROPOUT_RATE = 0.2
-    checkpoint_path = './model/model.h5'
-    tokenizer = RobertaTokenizer.from_pretrained('roberta-base')
-    test = pd.read_csv('./data/tweets_preprocessed.csv')
-    print('test shape =', test.shape)
-    sentence = np.array(test.sentence).tolist()
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def input_cache_key(input_csv, tokenizer, max_sequence_length, extra=''):
+    """Hash of the input file contents, tokenizer and sequence length."""
+    h = hashlib.sha256(file_sha256(input_csv).encode('utf-8'))
+    h.update(f"|{type(tokenizer).__name__}|{tokenizer.name_or_path}|{len(tokenizer)}"
+             f"|{max_sequence_length}|{extra}".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def write_input_arrays(df, columns, tokenizer, max_sequence_length, cache_dir):
+    """Tokenizes straight into on-disk .npy memmaps, one row at a time."""
+    tmp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    try:
+        arrays = [np.lib.format.open_memmap(os.path.join(tmp_dir, name + '.npy'), mode='w+',
+                                            dtype=np.int32, shape=(len(df), max_sequence_length))
+                  for name in INPUT_ARRAY_NAMES]
+        for i, instance in enumerate(tqdm(df[columns].itertuples(index=False), total=len(df))):
+            rows = _convert_to_transformer_inputs(str(instance.sentence), str(instance.sentence2), tokenizer, max_sequence_length)
+            for arr, row in zip(arrays, rows):
+                arr[i] = row
+        for arr in arrays:
+            arr.flush()
+        del arrays
+        # Publish the cache only once it is complete
+        try:
+            os.replace(tmp_dir, cache_dir)
+        except OSError:
+            # A concurrent run with the same key published first; its arrays are identical
+            if not os.path.isdir(cache_dir):
+                raise
+    finally:
+        # Leftover after a failed run or a lost publish race
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load_input_arrays(cache_dir):
+    """Memory-maps the cached arrays read-only; nothing is loaded into RAM up front."""
+    return [np.load(os.path.join(cache_dir, name + '.npy'), mmap_mode='r') for name in INPUT_ARRAY_NAMES]
+
+
+def cached_input_arrays(df, columns, tokenizer, max_sequence_length, cache_root, key):
+    cache_dir = os.path.join(cache_root, key)
+    if os.path.isdir(cache_dir):
+        print(f"Using cached inputs: {cache_dir}")
+    else:
+        print(f"Tokenizing inputs into cache: {cache_dir}")
+        os.makedirs(cache_root, exist_ok=True)
+        write_input_arrays(df, columns, tokenizer, max_sequence_length, cache_dir)
+    return load_input_arrays(cache_dir)
+
+
+def build_input_columns(test):
+    """Adds the two model input text columns (sentence, sentence2) to the token rows."""
     test['sentence'] = test.sentence.apply(lambda x: preprocessing(x)) \
                        + "[SEP]" + test.word.apply(lambda x: preprocessing(x)) \
                        + "[SEP]" + test.pos.apply(lambda x: preprocessing(x)) \
@@ -98,20 +137,61 @@ if __name__ == '__main__':
                         + "[SEP]" + test.word.apply(lambda x: preprocessing(x)) \
                         + "[SEP]" + test.pos.apply(lambda x: preprocessing(x)) \
                         + "[SEP]" + test.tag.apply(lambda x: preprocessing(x))
+    return test
+
+
+if __name__ == '__main__':
+    MAX_SEQUENCE_LENGTH = 128
+    DROPOUT_RATE = 0.2
+    BATCH_SIZE = 32
+    NUM_THREADS = None      # torch intra-op threads; None keeps the torch default
+    TORCH_COMPILE = False   # optional torch.compile of the model
+    PREFILTER = False       # opt in: skip rows that cannot be metaphor targets (see prefilter.py)
+    checkpoint_path = './model/model.pt'
+    input_csv = './data/tweets_preprocessed.csv'
+    input_cache_dir = './cache'
+    # Predictions of a run with PREFILTER = False, used to measure the pre-filter's recall
+    reference_predict_csv = './predict/predict_full.csv'
+    tokenizer = RobertaTokenizer.from_pretrained('roberta-base')
+    test = pd.read_csv(input_csv)
+    print('test shape =', test.shape)
+
+    keep = candidate_mask(test) if PREFILTER else np.ones(len(test), dtype=bool)
+    print(f"Pre-filter skipped {int((~keep).sum())} of {len(test)} rows")
+    candidates = build_input_columns(test[keep].copy())
     
     input_categories = ['sentence', 'sentence2']
-    test_inputs = compute_input_arrays(test, input_categories, tokenizer, MAX_SEQUENCE_LENGTH)
+    # The kept rows are part of the key, so changing the filter never reuses stale arrays
+    cache_key = input_cache_key(input_csv, tokenizer, MAX_SEQUENCE_LENGTH,
+                                extra=hashlib.sha256(np.packbits(keep).tobytes()).hexdigest())
     
     if os.path.exists(checkpoint_path):
         print(f"Loading weights from checkpoint: {checkpoint_path}")
-        model = create_model()
-        model.load_weights(checkpoint_path)
+        model = load_model(checkpoint_path, DROPOUT_RATE, NUM_THREADS, TORCH_COMPILE)
+    elif os.path.exists('./model/model.h5'):
+        sys.exit(f"Checkpoint not found: {checkpoint_path}. Convert './model/model.h5' first with convert_weights.py")
     else:
         sys.exit(f"Checkpoint not found: {checkpoint_path}")
     
-    pred = np.argmax(model.predict(test_inputs), axis=1)
+    # Identifies input, tokenizer and checkpoint, so recall is only measured against a matching full run
+    run_key = input_cache_key(input_csv, tokenizer, MAX_SEQUENCE_LENGTH, extra=file_sha256(checkpoint_path))
+
+    # Skipped rows are labelled non-metaphor so predict.csv keeps one row per token
+    pred = np.zeros(len(test), dtype=int)
+    if keep.any():
+        test_inputs = cached_input_arrays(candidates, input_categories, tokenizer, MAX_SEQUENCE_LENGTH,
+                                          input_cache_dir, cache_key)
+        pred[keep] = np.argmax(predict(model, test_inputs, BATCH_SIZE), axis=1)
     test['predict'] = pred
-    test['sentence'] = sentence
 
     headers = ['sentence', 'word', 'predict']
-    test[headers].to_csv('./predict/predict.csv', index=False, header=True)
\ No newline at end of file
+    test[headers].to_csv('./predict/predict.csv', index=False, header=True)
+
+    if not PREFILTER:
+        save_reference(test[headers], reference_predict_csv, run_key)
+    elif os.path.exists(reference_predict_csv):
+        recall = prefilter_recall(reference_predict_csv, pred, run_key)
+        if recall is not None:
+            print(f"Pre-filter recall vs full run '{reference_predict_csv}': {recall:.4f}")
+    else:
+        print(f"No full run at '{reference_predict_csv}'; run once with PREFILTER = False to measure recall")
\ No newline at end of file
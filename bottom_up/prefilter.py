@@ -0,0 +1,65 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from sklearn.metrics import recall_score
+from spacy.lang.en.stop_words import STOP_WORDS
+
+# Universal POS tags that cannot be metaphor targets (function words, punctuation, numbers)
+SKIP_POS = {"PUNCT", "DET", "ADP", "CCONJ", "SCONJ", "PART", "PRON", "NUM", "SYM", "SPACE"}
+
+# Fine-grained tags for remaining function words (existential there, wh-words, possessive 's)
+SKIP_TAGS = {"EX", "WDT", "WP", "WP$", "POS", "HYPH"}
+
+# Stopwords are only dropped when tagged outside these POS, so content verbs like "make" survive
+CONTENT_POS = {"NOUN", "PROPN", "VERB", "ADJ"}
+
+
+def candidate_mask(df, skip_pos=SKIP_POS, skip_tags=SKIP_TAGS, stopwords=STOP_WORDS, content_pos=CONTENT_POS):
+    """Boolean mask of token rows that can still be metaphor targets.
+
+    Uses the `word`, `pos` and `tag` columns of tweets_preprocessed.csv; a row is
+    dropped if its POS or tag is a function-word class, if the word has no letter
+    or digit, or if it is a stopword not tagged as a content word.
+    """
+    word = df['word'].fillna('').astype(str).str.lower()
+    pos = df['pos'].fillna('').astype(str)
+    tag = df['tag'].fillna('').astype(str)
+
+    is_punct = ~word.str.contains(r'[a-z0-9]', regex=True)
+    is_stopword = word.isin(stopwords) & ~pos.isin(content_pos)
+    skip = pos.isin(skip_pos) | tag.isin(skip_tags) | is_punct | is_stopword
+    return ~skip.to_numpy()
+
+
+def reference_meta_path(reference_csv):
+    return os.path.splitext(reference_csv)[0] + '.json'
+
+
+def save_reference(df, reference_csv, run_key):
+    """Writes a full run's predictions plus the key of the run that produced them."""
+    df.to_csv(reference_csv, index=False, header=True)
+    with open(reference_meta_path(reference_csv), 'w', encoding='utf-8') as f:
+        json.dump({'run_key': run_key, 'n_rows': len(df)}, f, indent=2)
+
+
+def prefilter_recall(reference_csv, pred, run_key):
+    """Recall of the filtered run's labels against a full (unfiltered) run's predict.csv.
+
+    Returns None when the reference was produced from a different input, tokenizer or checkpoint.
+    """
+    meta_path = reference_meta_path(reference_csv)
+    if not os.path.exists(meta_path):
+        print(f"No run key at '{meta_path}'; rerun with PREFILTER = False to measure recall")
+        return None
+    with open(meta_path, encoding='utf-8') as f:
+        reference_key = json.load(f).get('run_key')
+    if reference_key != run_key:
+        print(f"Reference '{reference_csv}' comes from a different input or checkpoint; skipping recall")
+        return None
+
+    reference = pd.read_csv(reference_csv)
+    if len(reference) != len(pred):
+        print(f"Reference '{reference_csv}' has {len(reference)} rows, expected {len(pred)}; skipping recall")
+        return None
+    return recall_score(reference['predict'].astype(int), np.asarray(pred), zero_division=1.0)
@@ -0,0 +1,23 @@
+import tensorflow as tf
+from transformers import RobertaConfig, TFRobertaModel
+
+
+def create_model(max_sequence_length, dropout_rate):
+    """Original Keras model; only needed to read `model.h5` when converting weights."""
+    input_id = tf.keras.layers.Input((max_sequence_length,), dtype=tf.int32)
+    input_mask = tf.keras.layers.Input((max_sequence_length,), dtype=tf.int32)
+    input_atn = tf.keras.layers.Input((max_sequence_length,), dtype=tf.int32)
+    input_id2 = tf.keras.layers.Input((max_sequence_length,), dtype=tf.int32)
+    input_mask2 = tf.keras.layers.Input((max_sequence_length,), dtype=tf.int32)
+    input_atn2 = tf.keras.layers.Input((max_sequence_length,), dtype=tf.int32)
+    config = RobertaConfig.from_pretrained('roberta-base', output_hidden_states=False)
+    base_model = TFRobertaModel.from_pretrained('roberta-base', config=config)
+    TransformerA = base_model(input_id, attention_mask=input_mask, token_type_ids=input_atn)[0]
+    TransformerB = base_model(input_id2, attention_mask=input_mask2, token_type_ids=input_atn2)[0]
+    output = tf.keras.layers.GlobalAveragePooling1D()(TransformerA)
+    output2 = tf.keras.layers.GlobalAveragePooling1D()(TransformerB)
+    x = tf.keras.layers.Concatenate()([output, output2])
+    x = tf.keras.layers.Dropout(dropout_rate)(x)
+    x = tf.keras.layers.Dense(2, activation='softmax')(x)
+    model = tf.keras.models.Model(inputs=[input_id, input_mask, input_atn, input_id2, input_mask2, input_atn2], outputs=x)
+    return model
@@ -0,0 +1,53 @@
+import numpy as np
+import torch
+from torch import nn
+from tqdm import tqdm
+from transformers import RobertaConfig, RobertaModel
+
+
+class MetaphorModel(nn.Module):
+    """PyTorch port of the Keras `create_model` architecture.
+
+    One shared RoBERTa encodes both inputs, each branch is mean-pooled over the
+    full sequence (like GlobalAveragePooling1D without a mask), the two pooled
+    vectors are concatenated and fed to a 2-way dense softmax.
+    """
+
+    def __init__(self, config, dropout_rate=0.2):
+        super().__init__()
+        self.roberta = RobertaModel(config, add_pooling_layer=False)
+        self.dropout = nn.Dropout(dropout_rate)
+        self.classifier = nn.Linear(2 * config.hidden_size, 2)
+
+    def forward(self, input_id, input_mask, input_atn, input_id2, input_mask2, input_atn2):
+        transformer_a = self.roberta(input_id, attention_mask=input_mask, token_type_ids=input_atn)[0]
+        transformer_b = self.roberta(input_id2, attention_mask=input_mask2, token_type_ids=input_atn2)[0]
+        x = torch.cat([transformer_a.mean(dim=1), transformer_b.mean(dim=1)], dim=-1)
+        x = self.dropout(x)
+        return torch.softmax(self.classifier(x), dim=-1)
+
+
+def load_model(checkpoint_path, dropout_rate=0.2, num_threads=None, torch_compile=False):
+    """Build the model from a converted `model.pt` state dict, ready for inference."""
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    config = RobertaConfig.from_pretrained('roberta-base', output_hidden_states=False)
+    model = MetaphorModel(config, dropout_rate)
+    model.load_state_dict(torch.load(checkpoint_path, map_location='cpu'))
+    model.eval()
+    if torch_compile:
+        model = torch.compile(model)
+    return model
+
+
+def predict(model, inputs, batch_size=32):
+    """Return class probabilities for the six input arrays, fed in slices."""
+    n_rows = len(inputs[0])
+    probs = []
+    with torch.inference_mode():
+        for start in tqdm(range(0, n_rows, batch_size)):
+            batch = [torch.as_tensor(np.asarray(arr[start:start + batch_size]), dtype=torch.long) for arr in inputs]
+            probs.append(model(*batch).numpy())
+    if not probs:
+        return np.zeros((0, 2), dtype=np.float32)
+    return np.concatenate(probs)
@@ -0,0 +1,123 @@
+import csv
+import sys
+from collections import Counter
+
+import pandas as pd
+from tqdm import tqdm
+
+from lexicon import DOMAIN_SEEDS, LEXICON_DIR, load_lexicon
+
+# Define AI-related terms
+AI_TERMS = {
+    "ai", "chatgpt", "genai", "artificial intelligence",
+    "machine", "llm", "deep learning", "machine learning",
+    "natural language processing", "generativeai"
+}
+
+MATCH_COLUMNS = ["domain", "lexicon_version", "lemma", "ai_term", "pos", "context", "dep", "metaphor_type"]
+
+
+# === One lookup table for all domains: word -> {pos_label: (domain, ...)} ===
+def build_lexicon_index(domains, lexicon_dir=LEXICON_DIR):
+    """Returns (index, {domain: lexicon version}).
+
+    A domain's `stop_words` (DOMAIN_SEEDS) are left out of the index, so they never match;
+    its seed words are always kept.
+    """
+    index = {}
+    versions = {}
+    for domain in domains:
+        domain = sys.intern(domain)
+        words_by_pos, versions[domain] = load_lexicon(domain, lexicon_dir)
+        print(f"Lexicon '{domain}': version {versions[domain]}")
+        config = DOMAIN_SEEDS.get(domain, {})
+        seeds = {w.lower() for words in config.get("seeds", {}).values() for w in words}
+        stop_words = {w.lower() for w in config.get("stop_words") or ()} - seeds
+        for pos, words in words_by_pos.items():
+            pos = sys.intern(pos)
+            for word in words:
+                if word.lower() in stop_words:
+                    continue
+                entry = index.setdefault(sys.intern(word.lower()), {})
+                entry.setdefault(pos, []).append(domain)
+    # Freeze to tuples; domains are interned so every entry shares the same strings
+    index = {word: {pos: tuple(dict.fromkeys(ds)) for pos, ds in entry.items()} for word, entry in index.items()}
+    return index, versions
+
+
+def lookup(index, word, pos):
+    entry = index.get(word)
+    return entry.get(pos, ()) if entry else ()
+
+
+def _detect_token(token, index, ai_terms):
+    token_text = token.text.lower()
+    token_lemma = token.lemma_.lower()
+    head_text = token.head.text.lower()
+    head_lemma = token.head.lemma_.lower()
+    ai_subject = token_text in ai_terms and token.dep_ == "nsubj"
+
+    # --- Type-II: Subject-Verb-Object (SVO) ---
+    # Domain verb governed by an AI term, whatever its dep ("an AI that thinks": relcl)
+    verb_domains = lookup(index, token_text, "verb") if head_text in ai_terms else ()
+    for domain in verb_domains:
+        yield (domain, token_lemma, head_text, token.pos_, token.dep_, "SVO")
+
+    # AI is subject of a domain verb
+    if ai_subject:
+        for domain in lookup(index, head_lemma, "verb"):
+            yield (domain, head_lemma, token_text, token.head.pos_, token.dep_, "SVO")
+
+    if head_text not in ai_terms or ai_subject:
+        return
+
+    # --- Type-I: Nominal (AI is smart) / Type-III: Adjective-Noun (smart AI) ---
+    if token.dep_ in {"acomp", "attr"}:
+        metaphor_type = "Nominal"
+    elif token.dep_ == "amod":
+        metaphor_type = "Adj-Noun"
+    else:
+        return
+    for domain in lookup(index, token_text, "adj"):
+        if domain not in verb_domains:
+            yield (domain, token_text, head_text, token.pos_, token.dep_, metaphor_type)
+
+
+# === All domain-tagged matches of one doc, deduplicated per token on (domain, lemma, type) ===
+def detect_matches(doc, index, ai_terms=AI_TERMS):
+    for token in doc:
+        seen = set()
+        for match in _detect_token(token, index, ai_terms):
+            key = (match[0], match[1], match[5])
+            if key not in seen:
+                seen.add(key)
+                yield match
+
+
+def detect_to_csv(nlp, texts, index, versions, output_csv, batch_size=50):
+    """Streams matches to `output_csv` and returns (n_matches, lemma_counter, type_counter)."""
+    lemma_counter = Counter()
+    type_counter = Counter()
+    n_matches = 0
+
+    with open(output_csv, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(MATCH_COLUMNS)
+        for doc in tqdm(nlp.pipe(texts, batch_size=batch_size, disable=["ner"]), total=len(texts)):
+            for domain, lemma, ai_term, pos, dep, metaphor_type in detect_matches(doc, index):
+                writer.writerow([domain, versions[domain], lemma, ai_term, pos, doc.text, dep, metaphor_type])
+                lemma_counter[(domain, lemma)] += 1
+                type_counter[(domain, metaphor_type)] += 1
+                n_matches += 1
+
+    return n_matches, lemma_counter, type_counter
+
+
+def write_frequencies(lemma_counter, type_counter, versions, output_lemmas_csv, output_types_csv):
+    freq_lemmas = pd.DataFrame([(d, versions[d], l, n) for (d, l), n in lemma_counter.items()],
+                               columns=["domain", "lexicon_version", "lemma", "frequency"]).sort_values(by="frequency", ascending=False)
+    freq_lemmas.to_csv(output_lemmas_csv, index=False)
+
+    freq_types = pd.DataFrame([(d, versions[d], t, n) for (d, t), n in type_counter.items()],
+                              columns=["domain", "lexicon_version", "metaphor_type", "count"]).sort_values(by="count", ascending=False)
+    freq_types.to_csv(output_types_csv, index=False)
@@ -1,52 +1,124 @@
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+
 import nltk
 from nltk.corpus import wordnet as wn
 import pandas as pd
 
-nltk.download('wordnet')
-nltk.download('omw-1.4')
+from lexicon import DOMAIN_SEEDS, LEXICON_DIR, save_lexicon
 
-# === Define Health-Related Seeds ===
-health_seeds = {
-    "noun": ["infection", "virus", "vaccine", "epidemic", "infestation", "disease", "medicine", "treatment", "health"],
-    "verb": ["monitor", "infect", "heal", "treat", "spread"],
-    "adj": ["contaminated", "safe", "healthy", "sick", "infected"]
+# === POS mapping ===
+# Literal WordNet POS letters: reading wn.NOUN etc. would load the corpus before ensure_wordnet() runs
+pos_map = {
+    "noun": "n",
+    "verb": "v",
+    "adj": "a"
 }
 
-# === Function: check if gloss suggests human context ===
-def is_human_related(synset):
-    gloss = synset.definition().lower()
-    return any(term in gloss for term in ["person", "people", "patient", "body", "individual", "human", "someone"])
 
-# === Function to collect seed + filtered WordNet synonyms ===
-def get_human_related_words_with_seeds(seed_words, wn_pos, pos_label):
+# === Download WordNet data only when it is not installed yet ===
+def ensure_wordnet():
+    for resource, package in [("corpora/wordnet", "wordnet"), ("corpora/omw-1.4", "omw-1.4")]:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package)
+
+
+# === Compile all gloss terms into a single alternation regex ===
+def compile_gloss_filter(terms):
+    if not terms:
+        return None
+    # Longest first so overlapping terms resolve the same way on every run
+    alternation = "|".join(re.escape(t.lower()) for t in sorted(set(terms), key=len, reverse=True))
+    return re.compile(alternation)
+
+
+@lru_cache(maxsize=None)
+def gloss(synset):
+    return synset.definition().lower()
+
+
+@lru_cache(maxsize=None)
+def related_synsets(synset, relations):
+    related = []
+    for relation in relations:
+        related.extend(getattr(synset, relation)())
+    return tuple(related)
+
+
+# === Memoized traversal: synset plus everything within `depth` hops ===
+@lru_cache(maxsize=None)
+def expand_synset(synset, depth, relations):
+    reached = {synset}
+    if depth > 0:
+        for neighbour in related_synsets(synset, relations):
+            reached |= expand_synset(neighbour, depth - 1, relations)
+    return frozenset(reached)
+
+
+@lru_cache(maxsize=None)
+def synset_words(synset):
+    return tuple(lemma.name().replace("_", " ").lower() for lemma in synset.lemmas())
+
+
+# === Function to collect seed + expanded, gloss-filtered WordNet words ===
+def expand_seeds(seed_words, wn_pos, pos_label, depth=0, relations=(), gloss_filter=None, stop_words=frozenset()):
     records = [{"word": seed.lower(), "pos": pos_label} for seed in seed_words]  # Always keep seeds
 
     for seed in seed_words:
-        synsets = wn.synsets(seed, pos=wn_pos)
-        for syn in synsets:
-            if is_human_related(syn):
-                for lemma in syn.lemmas():
-                    word = lemma.name().replace("_", " ").lower()
+        for syn in wn.synsets(seed, pos=wn_pos):
+            for reached in expand_synset(syn, depth, relations):
+                if gloss_filter is not None and not gloss_filter.search(gloss(reached)):
+                    continue
+                # Hypernyms/hyponyms of a synset share its POS, so label them with the seed's POS
+                for word in synset_words(reached):
+                    if word in stop_words:
+                        continue
                     records.append({"word": word, "pos": pos_label})
     return records
 
-# === POS mapping ===
-pos_map = {
-    "noun": wn.NOUN,
-    "verb": wn.VERB,
-    "adj": wn.ADJ
-}
 
-# === Combine everything into one CSV ===
-all_records = []
+def build_lexicon(config):
+    relations = tuple(config.get("relations") or ())
+    depth = config.get("depth", 0)
+    gloss_filter = compile_gloss_filter(config.get("gloss_terms"))
+    stop_words = frozenset(w.lower() for w in config.get("stop_words") or ())
+
+    all_records = []
+    for pos_label, seeds in config["seeds"].items():
+        if not config.get("expand", True):
+            all_records.extend({"word": seed.lower(), "pos": pos_label} for seed in seeds)
+            continue
+        all_records.extend(expand_seeds(seeds, pos_map[pos_label], pos_label, depth, relations, gloss_filter, stop_words))
+
+    # Remove duplicates and sort
+    return pd.DataFrame(all_records, columns=["word", "pos"]).drop_duplicates().sort_values(by=["pos", "word"])
+
+
+def lexicon_version(config):
+    """Stable id of a build: same config and WordNet release give the same version."""
+    payload = json.dumps({"config": config, "wordnet": wn.get_version()}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
 
-for pos_label, seeds in health_seeds.items():
-    wn_pos = pos_map[pos_label]
-    entries = get_human_related_words_with_seeds(seeds, wn_pos, pos_label)
-    all_records.extend(entries)
+if __name__ == "__main__":
+    domains = list(DOMAIN_SEEDS)
+    lexicon_dir = LEXICON_DIR
 
-# Remove duplicates and sort
-df = pd.DataFrame(all_records).drop_duplicates().sort_values(by=["pos", "word"])
-df.to_csv("wordnet_human_health.csv", index=False)
+    ensure_wordnet()
 
-print(f"✅ Saved {len(df)} words (including original seeds) to 'wordnet_human_intelligence_all.csv'")
+    for domain in domains:
+        config = DOMAIN_SEEDS[domain]
+        df = build_lexicon(config)
+        metadata = {
+            "version": lexicon_version(config),
+            "wordnet_version": wn.get_version(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": config
+        }
+        csv_path, _ = save_lexicon(df, domain, metadata, lexicon_dir)
+        print(f"✅ Saved {len(df)} '{domain}' words (including original seeds) to '{csv_path}'")
@@ -0,0 +1,108 @@
+import json
+import os
+import pandas as pd
+
+# Bump when the on-disk lexicon layout changes
+LEXICON_FORMAT_VERSION = 1
+
+# Default location of generated lexicons (relative to top_down/)
+LEXICON_DIR = "./lexicons"
+
+# === Domain seed configs ===
+# seeds:      seed words per POS label, always kept in the lexicon
+# expand:     follow WordNet at all (False = seeds only, until the expanded list has been reviewed)
+# depth:      hypernym/hyponym hops to follow from each seed synset (0 = synonyms only)
+# relations:  WordNet synset relations to follow while expanding
+# gloss_terms: keep a synset only if its gloss contains one of these (None = keep all)
+# stop_words: words to leave out of the lexicon (seeds are always kept); also never matched by the detector
+#
+# Expansion for emotion and intelligence is not vetted: unfiltered WordNet synonyms of seeds such
+# as love, suffer, learn and think pull in generic or off-topic words. Review the expanded list and
+# fill in stop_words before switching `expand` on for them.
+DOMAIN_SEEDS = {
+    "health": {
+        "seeds": {
+            "noun": ["infection", "virus", "vaccine", "epidemic", "infestation", "disease", "medicine", "treatment", "health"],
+            "verb": ["monitor", "infect", "heal", "treat", "spread"],
+            "adj": ["contaminated", "safe", "healthy", "sick", "infected"]
+        },
+        "expand": True,
+        "depth": 0,
+        "relations": ["hypernyms", "hyponyms"],
+        "gloss_terms": ["person", "people", "patient", "body", "individual", "human", "someone"],
+        "stop_words": []
+    },
+    "emotion": {
+        "seeds": {
+            "noun": ["emotion", "feeling", "mood", "joy", "fear", "anger", "sadness"],
+            "verb": ["feel", "fear", "hate", "love", "enjoy", "suffer", "worry"],
+            "adj": ["emotional", "angry", "happy", "sad", "afraid", "hopeful", "fearful"]
+        },
+        "expand": False,
+        "depth": 0,
+        "relations": ["hypernyms", "hyponyms"],
+        "gloss_terms": None,
+        "stop_words": []
+    },
+    "intelligence": {
+        "seeds": {
+            "noun": ["intelligence", "logic", "reason", "brain", "understanding"],
+            "verb": ["think", "understand", "analyze", "reason", "comprehend", "learn"],
+            "adj": ["smart", "intelligent", "dumb", "logical", "brilliant", "clever"]
+        },
+        "expand": False,
+        "depth": 0,
+        "relations": ["hypernyms", "hyponyms"],
+        "gloss_terms": None,
+        "stop_words": []
+    }
+}
+
+
+def lexicon_paths(domain, lexicon_dir=LEXICON_DIR):
+    """Return the (csv, metadata json) paths of a domain lexicon."""
+    base = os.path.join(lexicon_dir, f"{domain}_lexicon")
+    return base + ".csv", base + ".json"
+
+
+def save_lexicon(df, domain, metadata, lexicon_dir=LEXICON_DIR):
+    """Write a word/pos lexicon plus its version metadata side by side."""
+    os.makedirs(lexicon_dir, exist_ok=True)
+    csv_path, meta_path = lexicon_paths(domain, lexicon_dir)
+    df.to_csv(csv_path, index=False, columns=["word", "pos"])
+    metadata = dict(metadata, format_version=LEXICON_FORMAT_VERSION, domain=domain, n_words=len(df))
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2, sort_keys=True)
+    return csv_path, meta_path
+
+
+# Version reported for lexicons built from the seed words alone
+SEED_LEXICON_VERSION = "seeds"
+
+
+def load_lexicon(domain, lexicon_dir=LEXICON_DIR):
+    """Load a domain lexicon as ({pos_label: set(words)}, version).
+
+    Falls back to the domain's seed words, with version "seeds", when no lexicon
+    has been generated yet; outputs record the version so such runs stand out.
+    """
+    csv_path, meta_path = lexicon_paths(domain, lexicon_dir)
+    if not os.path.exists(csv_path):
+        print(f"⚠️ No lexicon at '{csv_path}', using '{domain}' seed words (run generate_wordlist.py)")
+        words = {pos: {w.lower() for w in words} for pos, words in DOMAIN_SEEDS[domain]["seeds"].items()}
+        return words, SEED_LEXICON_VERSION
+
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError(f"Lexicon '{csv_path}' has no metadata '{meta_path}'; "
+                                f"regenerate it with generate_wordlist.py")
+    with open(meta_path, encoding="utf-8") as f:
+        metadata = json.load(f)
+    if metadata.get("format_version") != LEXICON_FORMAT_VERSION:
+        raise ValueError(f"Lexicon '{csv_path}' has format version {metadata.get('format_version')}, "
+                         f"expected {LEXICON_FORMAT_VERSION}; regenerate it with generate_wordlist.py")
+
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    words = {}
+    for word, pos in zip(df["word"], df["pos"]):
+        words.setdefault(pos, set()).add(word)
+    return words, metadata["version"]
@@ -0,0 +1,39 @@
+import pandas as pd
+import spacy
+
+from detector import build_lexicon_index, detect_to_csv, write_frequencies
+
+# Load spaCy model
+nlp = spacy.load("en_core_web_sm")
+
+if __name__ == "__main__":
+    input_csv = "../shared_data/cleaned_tweets.csv"
+    # input_csv = "../shared_data/cleaned_tweets_shorten.csv"
+    # Any number of lexicons from ./lexicons, detected in a single pass
+    domains = ["emotion", "intelligence", "health"]
+    output_deps_csv = "./output/output_domains_dependency.csv"
+    output_lemmas_csv = "./output/domains_lemma_frequency.csv"
+    output_types_csv = "./output/domains_metaphor_type_counts.csv"
+
+    # Load every domain lexicon into one lookup index
+    index, versions = build_lexicon_index(domains)
+
+    # Load cleaned tweet data
+    try:
+        df = pd.read_csv(input_csv, encoding="latin-1")
+    except pd.errors.ParserError:
+        df = pd.read_csv(input_csv, engine="python", on_bad_lines="skip")
+
+    # Prepare texts
+    all_texts = df["sentence"].tolist()
+
+    print(f"Processing {len(all_texts)} tweets with spaCy...")
+
+    # Matches are written as they are found; only the frequency counters stay in memory
+    n_matches, lemma_counter, type_counter = detect_to_csv(nlp, all_texts, index, versions, output_deps_csv)
+    print(f"Saved {n_matches} matches to '{output_deps_csv}'")
+
+    # Frequency count
+    write_frequencies(lemma_counter, type_counter, versions, output_lemmas_csv, output_types_csv)
+
+    print(f"Frequencies saved to '{output_lemmas_csv}' and '{output_types_csv}'")